@@ -2,15 +2,25 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import fnmatch
+import functools
+import hashlib
+import itertools
 import json
 import mimetypes
 import os
-import subprocess
+import queue
+import re
+import ssl
 import sys
+import threading
 import time
-from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
+from urllib.parse import urlsplit
 
 
 def _fmt_eta(seconds: float | None) -> str:
@@ -28,6 +38,23 @@ def _fmt_eta(seconds: float | None) -> str:
     return f"{sec}s"
 
 
+_PROGRESS_FMT_TOTAL = "[{}/{}] ok={} failed={} remaining={} rate={:.2f}/s eta={}"
+_PROGRESS_FMT = "[{}] ok={} failed={} submitted={} rate={:.2f}/s"
+_PROGRESS_PAD = b" " * 140
+
+
+def _write_stderr(data: bytes) -> None:
+    # One write on the binary stream: no ljust()/print() formatting and a single syscall per progress update.
+    out = getattr(sys.stderr, "buffer", None)
+    if out is None:
+        sys.stderr.write(data.decode("utf-8"))
+        sys.stderr.flush()
+        return
+    sys.stderr.flush()
+    out.write(data)
+    out.flush()
+
+
 def _headers(api_key: str, workspace_id: Optional[str], principal_id: Optional[str]) -> dict[str, str]:
     h = {"Authorization": f"Bearer {api_key}"}
     if workspace_id:
@@ -37,52 +64,359 @@ def _headers(api_key: str, workspace_id: Optional[str], principal_id: Optional[s
     return h
 
 
-def _guess_content_type(path: Path) -> str:
-    ct, _ = mimetypes.guess_type(str(path))
+@functools.lru_cache(maxsize=256)
+def _content_type_for_suffix(suffix: str) -> str:
+    if suffix.endswith(".md"):
+        return "text/markdown"
+    ct, _ = mimetypes.guess_type("f" + suffix)
     return ct or "application/octet-stream"
 
 
-def ingest_one(
+def _guess_content_type(path: Path) -> str:
+    # Last two suffixes keep compound types like .tar.gz resolving the way guess_type() does.
+    return _content_type_for_suffix("".join(path.suffixes[-2:]).lower())
+
+
+# Files at least this large are streamed from disk instead of being read into memory:
+# sendfile(2) on plain-HTTP connections, _STREAM_CHUNK_BYTES reads over TLS.
+_STREAM_MIN_BYTES = 64 * 1024
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+
+class _FilePart:
+    """Body part streamed from an open file rather than held in memory."""
+
+    __slots__ = ("file", "size")
+
+    def __init__(self, file, size: int):
+        self.file = file
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class _RequestNotSent(ConnectionError):
+    """The connection failed before the whole request was written, so the server cannot have acted on it."""
+
+
+class _HTTPPool:
+    """Minimal HTTP/1.1 keep-alive connection pool over asyncio streams (stdlib only)."""
+
+    def __init__(self, api_url: str, *, timeout_s: float, connect_timeout_s: float):
+        parts = urlsplit(api_url)
+        https = parts.scheme == "https"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if https else 80)
+        self.netloc = parts.netloc
+        self.base_path = parts.path.rstrip("/")
+        self.ssl = ssl.create_default_context() if https else None
+        if self.ssl is not None:
+            # The API is served by uvicorn, which only speaks HTTP/1.1; say so up front to TLS proxies.
+            self.ssl.set_alpn_protocols(["http/1.1"])
+        self.timeout_s = timeout_s
+        self.connect_timeout_s = connect_timeout_s
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def _acquire(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        # Bounded separately from the request timeout so an unreachable host fails fast instead of waiting
+        # out the OS connect timeout in every worker.
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self.ssl), timeout=self.connect_timeout_s
+        )
+        return reader, writer, False
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except Exception:
+                pass
+
+    async def post(
+        self, path: str, *, headers: dict[str, str], body: list[bytes | memoryview | _FilePart]
+    ) -> tuple[int, str, bytes]:
+        for attempt in range(2):
+            reader, writer, reused = await self._acquire()
+            try:
+                status, reason, resp_headers, resp_body = await asyncio.wait_for(
+                    self._roundtrip(reader, writer, path, headers, body), timeout=self.timeout_s
+                )
+            except _RequestNotSent:
+                writer.transport.abort()
+                # The server closed an idle keep-alive connection; reconnect once.
+                if reused and not attempt:
+                    continue
+                raise
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # Failed after the request was sent: the upload may already be committed server-side, and a
+                # retry would ingest it again under a new doc_id.
+                writer.transport.abort()
+                raise
+            except BaseException:
+                # abort() rather than close(): don't keep flushing a half-sent body from a reused buffer.
+                writer.transport.abort()
+                raise
+            if resp_headers.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                self._idle.append((reader, writer))
+            return status, reason, resp_body
+        raise RuntimeError("unreachable")
+
+    async def _send_file(self, writer: asyncio.StreamWriter, part: _FilePart) -> None:
+        if self.ssl is None:
+            # Zero-copy from the page cache.
+            await asyncio.get_running_loop().sendfile(writer.transport, part.file, 0, part.size)
+            return
+        # TLS has to encrypt in user space; stream fixed-size chunks so memory stays flat per upload.
+        part.file.seek(0)
+        remaining = part.size
+        while remaining > 0:
+            chunk = await asyncio.to_thread(part.file.read, min(_STREAM_CHUNK_BYTES, remaining))
+            if not chunk:
+                raise RuntimeError(f"file shrank while uploading ({remaining} bytes short)")
+            writer.write(chunk)
+            await writer.drain()
+            remaining -= len(chunk)
+
+    async def _roundtrip(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        path: str,
+        headers: dict[str, str],
+        body: list[bytes | memoryview | _FilePart],
+    ) -> tuple[int, str, dict[str, str], bytes]:
+        content_length = sum(len(part) for part in body)
+        lines = [f"POST {self.base_path}{path} HTTP/1.1", f"Host: {self.netloc}", f"Content-Length: {content_length}"]
+        lines.extend(f"{k}: {v}" for k, v in headers.items())
+        # Headers + multipart framing + payload go out as one gathered write instead of a concatenated copy.
+        pending: list[bytes | memoryview] = [("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")]
+        try:
+            for part in body:
+                if isinstance(part, _FilePart):
+                    writer.writelines(pending)
+                    pending = []
+                    await self._send_file(writer, part)
+                else:
+                    pending.append(part)
+            writer.writelines(pending)
+            await writer.drain()
+        except ConnectionError as e:
+            raise _RequestNotSent(str(e)) from e
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before response")
+        _, status, reason = (status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""])[:3]
+        resp_headers: dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            resp_headers[k.strip().lower()] = v.strip()
+
+        if resp_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks: list[bytes] = []
+            while True:
+                size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            resp_body = b"".join(chunks)
+        elif "content-length" in resp_headers:
+            resp_body = await reader.readexactly(int(resp_headers["content-length"]))
+        else:
+            resp_body = await reader.read()
+            resp_headers["connection"] = "close"
+        return int(status), reason, resp_headers, resp_body
+
+
+class _ReadBuffer:
+    """Reusable per-consumer read buffer, so each upload doesn't allocate a fresh bytes object."""
+
+    def __init__(self, size: int = _STREAM_MIN_BYTES):
+        self._buf = bytearray(size)
+
+    def read(self, f, size: int) -> memoryview:
+        if size >= len(self._buf):
+            # Replace rather than resize: the old buffer may still be exported to a transport.
+            self._buf = bytearray(max(size + 1, len(self._buf) * 2))
+        view = memoryview(self._buf)
+        n = 0
+        while True:
+            if n == len(self._buf):
+                # File grew while reading; fall back to a plain read of the remainder.
+                return memoryview(bytes(view[:n]) + f.read())
+            got = f.readinto(view[n:])
+            if not got:
+                return view[:n]
+            n += got
+
+
+async def _read_file_async(f, size: int, buf: _ReadBuffer | None = None) -> bytes | memoryview:
+    # Keep blocking read(2) off the event loop so file I/O overlaps with in-flight uploads.
+    if buf is None:
+        return await asyncio.to_thread(f.read)
+    return await asyncio.to_thread(buf.read, f, size)
+
+
+def _multipart_body(
+    *, scope: str, file_path: Path, data: bytes | memoryview | _FilePart, content_type: str
+) -> tuple[list[bytes | memoryview | _FilePart], str]:
+    boundary = uuid.uuid4().hex
+    filename = file_path.name.replace('"', "%22").replace("\r", "").replace("\n", "")
+    head = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="scope"\r\n\r\n'
+        f"{scope}\r\n"
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return [head, data, tail], f"multipart/form-data; boundary={boundary}"
+
+
+async def ingest_one(
     *,
-    api_url: str,
+    pool: _HTTPPool,
     api_key: str,
     scope: str,
     file_path: Path,
     workspace_id: Optional[str],
     principal_id: Optional[str],
-    timeout_s: float,
+    buf: _ReadBuffer | None = None,
 ) -> str:
-    url = api_url.rstrip("/") + "/v1/ingest/document"
     headers = _headers(api_key, workspace_id, principal_id)
 
-    content_type = _guess_content_type(file_path)
-    cmd: list[str] = [
-        "curl",
-        "-sS",
-        "--fail-with-body",
-        "--max-time",
-        str(timeout_s),
-        "-X",
-        "POST",
-        url,
-        "-F",
-        f"scope={scope}",
-        "-F",
-        f"file=@{str(file_path)};type={content_type}",
-    ]
-    for k, v in headers.items():
-        cmd.extend(["-H", f"{k}: {v}"])
-
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    if proc.returncode != 0:
-        raise RuntimeError((proc.stderr or proc.stdout or "").strip() or f"curl failed with exit {proc.returncode}")
-
-    payload = json.loads(proc.stdout)
+    with open(file_path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= _STREAM_MIN_BYTES:
+            data = _FilePart(f, size)
+        else:
+            data = await _read_file_async(f, size, buf)
+        body, multipart_ct = _multipart_body(
+            scope=scope, file_path=file_path, data=data, content_type=_guess_content_type(file_path)
+        )
+        headers["Content-Type"] = multipart_ct
+
+        status, reason, raw = await pool.post("/v1/ingest/document", headers=headers, body=body)
+    text = raw.decode("utf-8", errors="replace")
+    if status >= 400:
+        raise RuntimeError(f"HTTP {status} {reason}: {text.strip()}")
+
+    payload = json.loads(text)
     return str(payload.get("doc_id") or "")
 
 
-def _iter_matching_files(root: Path, pattern: str):
+_RECURSIVE_NAME_GLOB = re.compile(r"^\*\*/([^/]+)$")
+_SIMPLE_SUFFIX_GLOB = re.compile(r"^\*(\.[^*?\[\]/]+)$")
+
+
+def _name_matcher(name_glob: str):
+    suffix_match = _SIMPLE_SUFFIX_GLOB.match(name_glob)
+    if suffix_match:
+        suffix = suffix_match.group(1)
+        return lambda name: name.endswith(suffix)
+    return lambda name: fnmatch.fnmatchcase(name, name_glob)
+
+
+def _scandir_walk(root: Path, name_glob: str):
+    # Iterative DFS over os.scandir: dirent types avoid a stat() per entry and nothing is buffered beyond the stack.
+    matches = _name_matcher(name_glob)
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    elif matches(e.name) and e.is_file():
+                        yield Path(e.path)
+                except OSError:
+                    continue
+
+
+_SCAN_DONE = object()
+
+
+def _walk_parallel(root: Path, name_glob: str, workers: int = 8):
+    # N threads share a queue of directories; scandir releases the GIL, so wide trees scan in parallel.
+    matches = _name_matcher(name_glob)
+    dirs: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+    out: queue.SimpleQueue = queue.SimpleQueue()
+    stop = threading.Event()
+    lock = threading.Lock()
+    in_flight = 1
+
+    def _worker() -> None:
+        nonlocal in_flight
+        while True:
+            d = dirs.get()
+            if d is None:
+                return
+            try:
+                if not stop.is_set():
+                    with os.scandir(d) as it:
+                        for e in it:
+                            try:
+                                if e.is_dir(follow_symlinks=False):
+                                    with lock:
+                                        in_flight += 1
+                                    dirs.put(e.path)
+                                elif matches(e.name) and e.is_file():
+                                    out.put(Path(e.path))
+                            except OSError:
+                                continue
+            except OSError:
+                pass
+            finally:
+                with lock:
+                    in_flight -= 1
+                    finished = in_flight == 0
+                if finished:
+                    for _ in range(workers):
+                        dirs.put(None)
+                    out.put(_SCAN_DONE)
+
+    dirs.put(str(root))
+    for i in range(workers):
+        threading.Thread(target=_worker, name=f"ragctl-scan-{i}", daemon=True).start()
+    try:
+        while True:
+            p = out.get()
+            if p is _SCAN_DONE:
+                return
+            yield p
+    finally:
+        stop.set()
+
+
+def _iter_matching_files(root: Path, pattern: str, *, scan_workers: int = 1):
     try:
+        m = _RECURSIVE_NAME_GLOB.match(pattern)
+        if m:
+            if scan_workers > 1:
+                yield from _walk_parallel(root, m.group(1), workers=scan_workers)
+            else:
+                yield from _scandir_walk(root, m.group(1))
+            return
         for p in root.glob(pattern):
             try:
                 if p.is_file():
@@ -93,7 +427,77 @@ def _iter_matching_files(root: Path, pattern: str):
         raise RuntimeError(f"glob failed for root={root} pattern={pattern}: {e}") from e
 
 
-def cmd_ingest_dir(args: argparse.Namespace) -> int:
+def _scan_cache_file(root: Path, pattern: str) -> Path:
+    base = Path(os.getenv("XDG_CACHE_HOME") or (Path.home() / ".cache")) / "ragctl"
+    key = hashlib.sha1(f"{root}|{pattern}".encode("utf-8", errors="surrogateescape")).hexdigest()
+    return base / f"scan-{key}.txt"
+
+
+def _scan_cache_valid(cache_file: Path, root: Path, ttl_s: float) -> bool:
+    try:
+        cached_at = cache_file.stat().st_mtime
+        return (time.time() - cached_at) < ttl_s and root.stat().st_mtime <= cached_at
+    except OSError:
+        return False
+
+
+def _iter_cached_paths(cache_file: Path):
+    # Drop entries deleted since the scan; the existence checks run in a small pool, a batch at a time.
+    with open(cache_file, encoding="utf-8", errors="surrogateescape") as f, ThreadPoolExecutor(8) as ex:
+        while True:
+            batch = [line.rstrip("\n") for line in itertools.islice(f, 512)]
+            if not batch:
+                return
+            for path, exists in zip(batch, ex.map(os.path.isfile, batch)):
+                if exists:
+                    yield Path(path)
+
+
+def _write_through_scan_cache(paths, cache_file: Path):
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        f = open(tmp, "w", encoding="utf-8", errors="surrogateescape")
+    except OSError:
+        yield from paths
+        return
+
+    # Only a walk that ran to completion is persisted (not one cut short by --limit or an error).
+    complete = False
+    cacheable = True
+    try:
+        for p in paths:
+            s = str(p)
+            if "\n" in s:
+                cacheable = False
+            else:
+                f.write(s + "\n")
+            yield p
+        complete = True
+    finally:
+        f.close()
+        try:
+            if complete and cacheable:
+                os.replace(tmp, cache_file)
+            else:
+                os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _iter_scan(args: argparse.Namespace, root: Path, pattern: str, *, scan_workers: int):
+    if getattr(args, "no_scan_cache", False):
+        return _iter_matching_files(root, pattern, scan_workers=scan_workers)
+
+    cache_file = _scan_cache_file(root, pattern)
+    ttl_s = float(getattr(args, "scan_cache_ttl", 600.0))
+    if not getattr(args, "refresh_scan_cache", False) and _scan_cache_valid(cache_file, root, ttl_s):
+        print(f"Using cached scan ({cache_file}) …", file=sys.stderr, flush=True)
+        return _iter_cached_paths(cache_file)
+    return _write_through_scan_cache(_iter_matching_files(root, pattern, scan_workers=scan_workers), cache_file)
+
+
+async def _ingest_dir(args: argparse.Namespace) -> int:
     root = Path(args.root).expanduser().resolve()
     if not root.exists():
         print(f"ERROR: root path does not exist: {root}", file=sys.stderr, flush=True)
@@ -102,6 +506,7 @@ def cmd_ingest_dir(args: argparse.Namespace) -> int:
     pattern = args.glob or "**/*.md"
     limit = int(args.limit or 0)
     prescan = bool(getattr(args, "prescan", False))
+    scan_workers = max(1, int(getattr(args, "scan_workers", 1) or 1))
 
     print(f"Scanning {root} for {pattern} …", file=sys.stderr, flush=True)
 
@@ -109,7 +514,7 @@ def cmd_ingest_dir(args: argparse.Namespace) -> int:
     if prescan:
         # Count first so we can show accurate totals/ETA, at the cost of slower startup.
         matched = 0
-        for _ in _iter_matching_files(root, pattern):
+        for _ in _iter_scan(args, root, pattern, scan_workers=scan_workers):
             matched += 1
             if limit > 0 and matched >= limit:
                 break
@@ -131,97 +536,112 @@ def cmd_ingest_dir(args: argparse.Namespace) -> int:
     completed = 0
     ok = 0
     submitted = 0
-    last_progress_ts = 0.0
     progress_is_tty = sys.stderr.isatty()
     progress_min_interval_s = 0.25 if progress_is_tty else 2.0
 
+    # Per-file result lines are buffered and written in one go on each progress tick (or every 512
+    # lines) rather than one write+flush per completion.
+    result_lines: list[str] = []
+
+    def _flush_results() -> None:
+        if result_lines:
+            sys.stdout.write("".join(result_lines))
+            sys.stdout.flush()
+            result_lines.clear()
+
     def _render_progress(*, final: bool = False) -> None:
-        nonlocal last_progress_ts
         now = time.time()
-        if not final and (now - last_progress_ts) < progress_min_interval_s:
-            return
-        last_progress_ts = now
+        _flush_results()
 
         elapsed = max(0.001, now - t0)
         rate = completed / elapsed
         if total is not None:
             remaining = max(0, int(total) - completed)
             eta = remaining / rate if rate > 0 else None
-            line = f"[{completed}/{total}] ok={ok} failed={len(failures)} remaining={remaining} rate={rate:.2f}/s eta={_fmt_eta(eta)}"
+            line = _PROGRESS_FMT_TOTAL.format(completed, total, ok, len(failures), remaining, rate, _fmt_eta(eta))
         else:
-            line = f"[{completed}] ok={ok} failed={len(failures)} submitted={submitted} rate={rate:.2f}/s"
-        if final:
-            print(line, file=sys.stderr)
+            line = _PROGRESS_FMT.format(completed, ok, len(failures), submitted, rate)
+        data = line.encode("utf-8")
+        if progress_is_tty and not final:
+            data += _PROGRESS_PAD[len(data) :] + b"\r"
         else:
-            if progress_is_tty:
-                print(line.ljust(140), end="\r", file=sys.stderr, flush=True)
-            else:
-                print(line, file=sys.stderr, flush=True)
-
-    def _run(p: Path) -> tuple[Path, str, float]:
-        start = time.time()
+            data += b"\n"
+        _write_stderr(data)
+
+    def _record(p: Path, result: str, dt_s: float) -> None:
+        nonlocal completed, ok
+        completed += 1
+        if result.startswith("ERROR:"):
+            failures.append((p, result))
+            print(file=sys.stderr, flush=True)
+            print(f"{p}: {result} ({dt_s:.2f}s)", file=sys.stderr, flush=True)
+        else:
+            ok += 1
+            result_lines.append(f"{p}: {result} ({dt_s:.2f}s)\n")
+            if len(result_lines) >= 512:
+                _flush_results()
+
+    async def _progress_ticker() -> None:
+        # Rendering runs on its own timer, so completions only bump counters.
+        while True:
+            await asyncio.sleep(progress_min_interval_s)
+            _render_progress()
+
+    concurrency = max(1, int(args.concurrency))
+    pending: asyncio.Queue[Path | None] = asyncio.Queue(maxsize=concurrency * 2)
+    pool = _HTTPPool(args.api_url, timeout_s=args.timeout_s, connect_timeout_s=args.connect_timeout_s)
+
+    async def _produce() -> None:
+        nonlocal submitted, total
+        path_iter = _iter_scan(args, root, pattern, scan_workers=scan_workers)
         try:
-            doc_id = ingest_one(
-                api_url=args.api_url,
-                api_key=args.api_key,
-                scope=args.scope,
-                file_path=p,
-                workspace_id=args.workspace_id,
-                principal_id=args.principal_id,
-                timeout_s=args.timeout_s,
-            )
-            if not doc_id:
-                raise RuntimeError("missing doc_id in response")
-            return p, doc_id, time.time() - start
-        except Exception as e:
-            return p, f"ERROR: {e}", time.time() - start
-
-    with ThreadPoolExecutor(max_workers=max(1, int(args.concurrency))) as ex:
-        pending = set()
-        path_iter = _iter_matching_files(root, pattern)
-        done_scanning = False
-
-        def _submit_next() -> bool:
-            nonlocal submitted, done_scanning, total
-            if limit > 0 and submitted >= limit:
-                done_scanning = True
-                return False
+            while not (limit > 0 and submitted >= limit):
+                p = await asyncio.to_thread(next, path_iter, None)
+                if p is None:
+                    break
+                await pending.put(p)
+                submitted += 1
+        finally:
+            path_iter.close()
+            if total is None or submitted < int(total):
+                total = submitted
+            for _ in range(concurrency):
+                await pending.put(None)
+
+    async def _consume() -> None:
+        buf = _ReadBuffer()
+        while True:
+            p = await pending.get()
+            if p is None:
+                return
+            start = time.time()
             try:
-                p = next(path_iter)
-            except StopIteration:
-                done_scanning = True
-                if total is None:
-                    total = submitted
-                elif submitted < int(total):
-                    total = submitted
-                return False
-            pending.add(ex.submit(_run, p))
-            submitted += 1
-            return True
-
-        # Prime the queue.
-        while len(pending) < int(args.concurrency) and _submit_next():
-            pass
-        if done_scanning and not pending and submitted == 0:
-            print("No files matched.", flush=True)
-            return 0
-
-        while pending:
-            done, pending = wait(pending, return_when=FIRST_COMPLETED)
-            for fut in done:
-                p, result, dt_s = fut.result()
-                completed += 1
-                if result.startswith("ERROR:"):
-                    failures.append((p, result))
-                    print(file=sys.stderr, flush=True)
-                    print(f"{p}: {result} ({dt_s:.2f}s)", file=sys.stderr, flush=True)
-                else:
-                    ok += 1
-                    print(f"{p}: {result} ({dt_s:.2f}s)", flush=True)
-                _render_progress()
+                doc_id = await ingest_one(
+                    pool=pool,
+                    api_key=args.api_key,
+                    scope=args.scope,
+                    file_path=p,
+                    workspace_id=args.workspace_id,
+                    principal_id=args.principal_id,
+                    buf=buf,
+                )
+                if not doc_id:
+                    raise RuntimeError("missing doc_id in response")
+                _record(p, doc_id, time.time() - start)
+            except Exception as e:
+                _record(p, f"ERROR: {e}", time.time() - start)
+
+    ticker = asyncio.create_task(_progress_ticker())
+    try:
+        await asyncio.gather(_produce(), *(_consume() for _ in range(concurrency)))
+    finally:
+        ticker.cancel()
+        await pool.close()
 
-            while len(pending) < int(args.concurrency) and _submit_next():
-                pass
+    _flush_results()
+    if submitted == 0:
+        print("No files matched.", flush=True)
+        return 0
 
     dt = time.time() - t0
     print(file=sys.stderr, flush=True)
@@ -232,6 +652,10 @@ def cmd_ingest_dir(args: argparse.Namespace) -> int:
     return 0 if not failures else 1
 
 
+def cmd_ingest_dir(args: argparse.Namespace) -> int:
+    return asyncio.run(_ingest_dir(args))
+
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="ragctl", description="rag-service helper CLI")
     sub = p.add_subparsers(dest="cmd", required=True)
@@ -244,9 +668,34 @@ def build_parser() -> argparse.ArgumentParser:
     ingest.add_argument("--scope", default="tenant", choices=["tenant", "workspace", "user"])
     ingest.add_argument("--workspace-id", default=os.getenv("RAG_WORKSPACE_ID"))
     ingest.add_argument("--principal-id", default=os.getenv("RAG_PRINCIPAL_ID"))
-    ingest.add_argument("--concurrency", type=int, default=4)
+    ingest.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Parallel uploads, one keep-alive connection each (default: 8)",
+    )
     ingest.add_argument("--timeout-s", type=float, default=30.0)
+    ingest.add_argument(
+        "--connect-timeout-s",
+        type=float,
+        default=10.0,
+        help="Seconds to wait for a new connection (TCP + TLS) to the API (default: 10)",
+    )
     ingest.add_argument("--limit", type=int, default=0, help="Optional cap for testing (0 = no cap)")
+    ingest.add_argument(
+        "--scan-workers",
+        type=int,
+        default=8,
+        help="Threads used to walk the tree for '**/<name>' globs (default: 8; 1 = single-threaded)",
+    )
+    ingest.add_argument(
+        "--scan-cache-ttl",
+        type=float,
+        default=600.0,
+        help="Reuse a previous scan of the same root/glob for this many seconds (default: 600)",
+    )
+    ingest.add_argument("--no-scan-cache", action="store_true", help="Always walk the tree; don't read or write the scan cache")
+    ingest.add_argument("--refresh-scan-cache", action="store_true", help="Ignore any cached scan and rewrite it")
     ingest.add_argument("--prescan", action="store_true", help="Count matches before uploading (slower start, accurate totals/ETA)")
     ingest.set_defaults(func=cmd_ingest_dir)
 
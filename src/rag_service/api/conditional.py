@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import hashlib
+
+from fastapi import Request, Response
+
+
+# Responses depend on the caller's credentials and scope headers.
+_VARY = "Authorization, X-Workspace-Id, X-Principal-Id"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def conditional_json(request: Request, body: bytes, extra_headers: dict[str, str] | None = None) -> Response:
+    """Serve pre-serialized JSON with a content-hash ETag; 304 when the client already has it."""
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": _VARY, **(extra_headers or {})}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
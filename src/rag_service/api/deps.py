@@ -1,34 +1,84 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Iterator
 
-from fastapi import Depends, Header, HTTPException
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi import HTTPException, Request, Security
+from fastapi.security import APIKeyHeader, HTTPBearer
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from rag_service.config.settings import settings
+from rag_service.db.session import ReadSessionLocal
 
 
-security = HTTPBearer(auto_error=False)
+_STATE_KEY = "rag_request_context"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RequestContext:
     tenant_id: str
     workspace_id: str | None
     principal_id: str | None
 
 
-def get_request_context(
-    credentials: HTTPAuthorizationCredentials | None = Depends(security),
-    x_workspace_id: str | None = Header(default=None, alias="X-Workspace-Id"),
-    x_principal_id: str | None = Header(default=None, alias="X-Principal-Id"),
-) -> RequestContext:
-    if not credentials or (credentials.scheme or "").lower() != "bearer":
-        raise HTTPException(status_code=401, detail="Missing Bearer token")
+def _resolve_context(headers: list[tuple[bytes, bytes]]) -> RequestContext | str:
+    authorization = workspace_id = principal_id = None
+    for name, value in headers:
+        if name == b"authorization":
+            authorization = authorization or value
+        elif name == b"x-workspace-id":
+            workspace_id = workspace_id or value
+        elif name == b"x-principal-id":
+            principal_id = principal_id or value
 
-    tenant_id = settings.tenant_id_for_api_key(credentials.credentials)
+    scheme, _, token = (authorization or b"").decode("latin-1").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return "Missing Bearer token"
+
+    tenant_id = settings.tenant_id_for_api_key(token)
     if not tenant_id:
-        raise HTTPException(status_code=401, detail="Invalid tenant API key")
+        return "Invalid tenant API key"
+
+    return RequestContext(
+        tenant_id=tenant_id,
+        workspace_id=workspace_id.decode("latin-1") if workspace_id else None,
+        principal_id=principal_id.decode("latin-1") if principal_id else None,
+    )
+
+
+class RequestContextMiddleware:
+    """Resolve the tenant context once per request from the raw ASGI headers (no dependency resolution)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})[_STATE_KEY] = _resolve_context(scope["headers"])
+        await self.app(scope, receive, send)
+
+
+# Documentation only: these put the Bearer scheme and the scope headers into the OpenAPI schema so /docs can
+# authorize. Their values are ignored; RequestContextMiddleware does the actual parsing.
+API_SECURITY = [
+    Security(HTTPBearer(auto_error=False)),
+    Security(APIKeyHeader(name="X-Workspace-Id", scheme_name="WorkspaceId", auto_error=False)),
+    Security(APIKeyHeader(name="X-Principal-Id", scheme_name="PrincipalId", auto_error=False)),
+]
+
+
+def get_request_context(request: Request) -> RequestContext:
+    ctx = request.scope.get("state", {}).get(_STATE_KEY)
+    if isinstance(ctx, RequestContext):
+        return ctx
+    raise HTTPException(status_code=401, detail=ctx or "Missing Bearer token")
 
-    return RequestContext(tenant_id=tenant_id, workspace_id=x_workspace_id, principal_id=x_principal_id)
 
+def get_read_db() -> Iterator[Session]:
+    # Request-scoped session for read-only handlers; closed (connection back to the pool) after the response.
+    session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
-from fastapi.responses import RedirectResponse
+from fastapi import FastAPI
 import structlog
-from starlette.middleware.sessions import SessionMiddleware
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from rag_service.api.routes.auth import router as auth_router
+from rag_service.api.deps import RequestContextMiddleware
+from rag_service.api.routes.auth import ADMIN_COOKIE, admin_token_valid, router as auth_router
 from rag_service.api.routes.health import router as health_router
 from rag_service.api.routes.retrieve import router as retrieve_router
 from rag_service.api.routes.ingest import router as ingest_router
@@ -26,43 +28,77 @@ from rag_service.retrieval.vector_search import VectorSearch
 logger = structlog.get_logger()
 
 
+def _open_vector_search() -> VectorSearch:
+    vs = VectorSearch()
+    try:
+        vs.ensure_schema()
+    except Exception:
+        vs.close()
+        raise
+    return vs
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # DB tables (bootstrap; Alembic later)
-    Base.metadata.create_all(bind=engine)
+    # DB tables (bootstrap; Alembic later) and the Weaviate schema are independent; set both up concurrently.
+    _, vs = await asyncio.gather(
+        asyncio.to_thread(Base.metadata.create_all, bind=engine),
+        asyncio.to_thread(_open_vector_search),
+    )
+    # Shared client for request handlers (keeps the Weaviate/embeddings connections warm).
+    app.state.vector_search = vs
 
-    # Ensure Weaviate schema exists
+    logger.info("rag_service_started", port=settings.rag_api_port)
     try:
-        vs = VectorSearch()
-        vs.ensure_schema()
+        yield
     finally:
         try:
             vs.close()
         except Exception:
             pass
 
-    logger.info("rag_service_started", port=settings.rag_api_port)
-    yield
-
 
 app = FastAPI(title="rag-service", version="0.1.0", lifespan=lifespan)
-@app.middleware("http")
-async def admin_ui_auth(request: Request, call_next):
-    if settings.admin_auth_enabled():
-        path = request.url.path
-        if path.startswith("/admin") or path in {"/docs", "/redoc", "/openapi.json"}:
-            if not request.session.get("rag_admin_authenticated"):
-                return RedirectResponse(url="/", status_code=303)
-
-    return await call_next(request)
-
-
-app.add_middleware(
-    SessionMiddleware,
-    secret_key=settings.admin_session_secret(),
-    session_cookie="rag_admin_session",
-    same_site="lax",
-)
+
+# Settings are fixed for the process lifetime; resolve the admin gate once instead of per request.
+_ADMIN_AUTH_ENABLED = settings.admin_auth_enabled()
+_ADMIN_GATED_PREFIXES = ("/admin",)
+_ADMIN_GATED_PATHS = frozenset({"/docs", "/redoc", "/openapi.json"})
+_REDIRECT_TO_LOGIN = [(b"location", b"/"), (b"content-length", b"0")]
+
+
+def _admin_cookie(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            token = cookie_parser(value.decode("latin-1")).get(ADMIN_COOKIE)
+            if token:
+                return token
+    return None
+
+
+class AdminUIAuth:
+    """Plain ASGI gate for the admin UI and API docs (no BaseHTTPMiddleware task group per request)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            path = scope["path"]
+            if path.startswith(_ADMIN_GATED_PREFIXES) or path in _ADMIN_GATED_PATHS:
+                if not admin_token_valid(_admin_cookie(scope)):
+                    await send({"type": "http.response.start", "status": 303, "headers": _REDIRECT_TO_LOGIN})
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+        await self.app(scope, receive, send)
+
+
+# Without admin credentials the gate is a no-op, so don't put it in the stack at all.
+if _ADMIN_AUTH_ENABLED:
+    app.add_middleware(AdminUIAuth)
+
+
+app.add_middleware(RequestContextMiddleware)
 
 
 app.include_router(auth_router)
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
+import time
+
 from fastapi import APIRouter, Form, Request, Response
 from fastapi.responses import HTMLResponse, RedirectResponse
 
@@ -8,11 +12,38 @@ from rag_service.config.settings import settings
 
 router = APIRouter(tags=["auth"])
 
-SESSION_KEY = "rag_admin_authenticated"
+# The admin session is a single signed token: "<expiry>.<hmac-sha256(secret, 'admin|<expiry>')>".
+ADMIN_COOKIE = "rag_admin"
+_LEGACY_SESSION_COOKIE = "rag_admin_session"
+ADMIN_SESSION_MAX_AGE_S = 14 * 24 * 3600
+_ADMIN_SECRET = settings.admin_session_secret().encode("utf-8")
+# Compared with hmac.compare_digest; login is refused up front when either is unset.
+_ADMIN_USERNAME = (settings.rag_admin_username or "").encode("utf-8")
+_ADMIN_PASSWORD = (settings.rag_admin_password or "").encode("utf-8")
+
+
+def _admin_mac(expires_at: str) -> str:
+    return hmac.new(_ADMIN_SECRET, b"admin|" + expires_at.encode("ascii"), hashlib.sha256).hexdigest()
+
+
+def issue_admin_token(now: float | None = None) -> str:
+    expires_at = str(int(now if now is not None else time.time()) + ADMIN_SESSION_MAX_AGE_S)
+    return f"{expires_at}.{_admin_mac(expires_at)}"
+
+
+def admin_token_valid(token: str | None) -> bool:
+    if not token:
+        return False
+    expires_at, _, mac = token.partition(".")
+    # str.isdigit() alone admits non-ASCII digits ("²") that int() rejects.
+    if not (expires_at.isascii() and expires_at.isdigit()) or int(expires_at) <= time.time():
+        return False
+    # compare_digest raises TypeError on non-ASCII str, so compare bytes.
+    return hmac.compare_digest(mac.encode("utf-8"), _admin_mac(expires_at).encode("ascii"))
 
 
 def _is_logged_in(request: Request) -> bool:
-    return bool(request.session.get(SESSION_KEY))
+    return admin_token_valid(request.cookies.get(ADMIN_COOKIE))
 
 
 def _login_page(*, error: bool) -> str:
@@ -102,6 +133,11 @@ def _login_page(*, error: bool) -> str:
 """
 
 
+# Only the error banner varies, so both variants are rendered (and encoded) once at import.
+_LOGIN_PAGE_OK = _login_page(error=False).encode("utf-8")
+_LOGIN_PAGE_ERR = _login_page(error=True).encode("utf-8")
+
+
 @router.get("/", response_class=HTMLResponse, include_in_schema=False)
 def root_login(request: Request, error: str | None = None) -> HTMLResponse:
     if not settings.admin_auth_enabled():
@@ -114,7 +150,7 @@ def root_login(request: Request, error: str | None = None) -> HTMLResponse:
     if _is_logged_in(request):
         return RedirectResponse(url="/admin/status", status_code=303)
 
-    return HTMLResponse(content=_login_page(error=bool(error)), headers={"Cache-Control": "no-store"})
+    return HTMLResponse(content=_LOGIN_PAGE_ERR if error else _LOGIN_PAGE_OK, headers={"Cache-Control": "no-store"})
 
 
 @router.head("/", include_in_schema=False)
@@ -133,16 +169,27 @@ def login(request: Request, username: str = Form(...), password: str = Form(...)
     if not settings.admin_auth_enabled():
         return RedirectResponse(url="/", status_code=303)
 
-    if username == settings.rag_admin_username and password == settings.rag_admin_password:
-        request.session.clear()
-        request.session[SESSION_KEY] = True
-        request.session["rag_admin_username"] = username
-        return RedirectResponse(url="/admin/status", status_code=303)
+    # Both digests are always evaluated (bitwise &), so timing doesn't reveal which field was wrong.
+    user_ok = hmac.compare_digest(username.encode("utf-8"), _ADMIN_USERNAME)
+    pass_ok = hmac.compare_digest(password.encode("utf-8"), _ADMIN_PASSWORD)
+    if user_ok & pass_ok:
+        resp = RedirectResponse(url="/admin/status", status_code=303)
+        resp.set_cookie(
+            ADMIN_COOKIE,
+            issue_admin_token(),
+            max_age=ADMIN_SESSION_MAX_AGE_S,
+            httponly=True,
+            samesite="lax",
+        )
+        resp.delete_cookie(_LEGACY_SESSION_COOKIE)
+        return resp
 
     return RedirectResponse(url="/?error=1", status_code=303)
 
 
 @router.get("/logout", include_in_schema=False)
 def logout(request: Request) -> RedirectResponse:
-    request.session.clear()
-    return RedirectResponse(url="/", status_code=303)
+    resp = RedirectResponse(url="/", status_code=303)
+    resp.delete_cookie(ADMIN_COOKIE)
+    resp.delete_cookie(_LEGACY_SESSION_COOKIE)
+    return resp
@@ -1,21 +1,25 @@
 from __future__ import annotations
 
+import base64
 from datetime import datetime
+from functools import lru_cache
+import json
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
-from pydantic import ConfigDict
-from sqlalchemy import func, or_, and_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+import redis
+from sqlalchemy import func, or_, and_, tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.sql.elements import ColumnElement
 
-from rag_service.api.deps import RequestContext, get_request_context
+from rag_service.api.conditional import conditional_json
+from rag_service.api.deps import API_SECURITY, RequestContext, get_read_db, get_request_context
+from rag_service.db.clients import redis_client
 from rag_service.db.models import Document, DocumentScope, DocumentStatus
-from rag_service.db.session import SessionLocal
 
 
-router = APIRouter(prefix="/v1", tags=["documents"])
+router = APIRouter(prefix="/v1", tags=["documents"], dependencies=API_SECURITY)
 
 
 class DocumentOut(BaseModel):
@@ -38,23 +42,32 @@ class DocumentOut(BaseModel):
     updated_at: datetime
 
 
+_DOCUMENT_LIST = TypeAdapter(list[DocumentOut])
+
+
 def _doc_access_predicate(ctx: RequestContext):
-    clauses = [and_(Document.tenant_id == ctx.tenant_id, Document.scope == DocumentScope.tenant)]
-    if ctx.workspace_id:
+    return _doc_access_clause(ctx.tenant_id, ctx.workspace_id, ctx.principal_id)
+
+
+# Clause trees are immutable, so one per (tenant, workspace, principal) is built and shared across requests.
+@lru_cache(maxsize=1024)
+def _doc_access_clause(tenant_id: str, workspace_id: Optional[str], principal_id: Optional[str]) -> ColumnElement[bool]:
+    clauses = [and_(Document.tenant_id == tenant_id, Document.scope == DocumentScope.tenant)]
+    if workspace_id:
         clauses.append(
             and_(
-                Document.tenant_id == ctx.tenant_id,
+                Document.tenant_id == tenant_id,
                 Document.scope == DocumentScope.workspace,
-                Document.workspace_id == ctx.workspace_id,
+                Document.workspace_id == workspace_id,
             )
         )
-        if ctx.principal_id:
+        if principal_id:
             clauses.append(
                 and_(
-                    Document.tenant_id == ctx.tenant_id,
+                    Document.tenant_id == tenant_id,
                     Document.scope == DocumentScope.user,
-                    Document.workspace_id == ctx.workspace_id,
-                    Document.principal_id == ctx.principal_id,
+                    Document.workspace_id == workspace_id,
+                    Document.principal_id == principal_id,
                 )
             )
     return or_(*clauses)
@@ -68,83 +81,134 @@ class DocumentStatusCountsOut(BaseModel):
     failed: int
 
 
+_COUNTS_CACHE_TTL_S = 2
+
+
 @router.get("/documents/counts", response_model=DocumentStatusCountsOut)
-def documents_counts(ctx: RequestContext = Depends(get_request_context)) -> DocumentStatusCountsOut:
-    session: Session = SessionLocal()
+def documents_counts(
+    request: Request,
+    ctx: RequestContext = Depends(get_request_context),
+    session: Session = Depends(get_read_db),
+) -> Response:
+    # The admin page polls this; a short-lived cache absorbs repeated ticks from the same caller.
+    cache_key = f"counts:{ctx.tenant_id}:{ctx.workspace_id or ''}:{ctx.principal_id or ''}"
+    r = redis_client()
     try:
-        rows = (
-            session.query(Document.status, func.count(Document.doc_id))
-            .filter(_doc_access_predicate(ctx))
-            .group_by(Document.status)
-            .all()
-        )
-        counts = {s.value: 0 for s in DocumentStatus}
-        for status, n in rows:
-            if status is None:
-                continue
-            key = status.value if isinstance(status, DocumentStatus) else str(status)
-            if key in counts:
-                counts[key] = int(n or 0)
-        total = sum(counts.values())
-        return DocumentStatusCountsOut(total=total, **counts)
-    finally:
-        session.close()
+        cached = r.get(cache_key)
+    except redis.RedisError:
+        cached = None
+    if cached:
+        return conditional_json(request, cached.encode())
+
+    # One aggregate row (COUNT ... FILTER per status) instead of a GROUP BY folded in Python.
+    row = (
+        session.query(*(func.count().filter(Document.status == s).label(s.value) for s in DocumentStatus))
+        .filter(_doc_access_predicate(ctx))
+        .one()
+    )
+
+    counts = {s.value: int(row._mapping[s.value] or 0) for s in DocumentStatus}
+    body = DocumentStatusCountsOut(total=sum(counts.values()), **counts).model_dump_json()
+    try:
+        r.set(cache_key, body, ex=_COUNTS_CACHE_TTL_S)
+    except redis.RedisError:
+        pass
+    return conditional_json(request, body.encode())
+
+
+# Keyset cursors are opaque to clients: urlsafe base64 of [sort, order, last sort value, last doc_id].
+def _encode_cursor(sort_key: str, order_key: str, value: object, doc_id: str) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, DocumentStatus):
+        value = value.value
+    raw = json.dumps([sort_key, order_key, value, doc_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_key: str, order_key: str) -> tuple[object, str]:
+    try:
+        s, o, value, doc_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if sort_key in {"created_at", "updated_at"}:
+            value = datetime.fromisoformat(value)
+        elif sort_key == "status":
+            value = DocumentStatus(value)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if (s, o) != (sort_key, order_key):
+        raise HTTPException(status_code=400, detail="Cursor does not match sort/order")
+    return value, str(doc_id)
 
 
 @router.get("/documents", response_model=list[DocumentOut])
 def list_documents(
+    request: Request,
     ctx: RequestContext = Depends(get_request_context),
     status: Optional[str] = Query(default=None, description="queued|processing|indexed|failed"),
     limit: int = Query(default=100, ge=1, le=500),
-    offset: int = Query(default=0, ge=0),
+    offset: int = Query(default=0, ge=0, description="deprecated; use after"),
+    after: Optional[str] = Query(default=None, description="cursor from a previous page's X-Next-Cursor header"),
     sort: str = Query(default="created_at", description="created_at|updated_at|filename|status|stage|progress|chunk_count|entity_count"),
     order: str = Query(default="desc", description="asc|desc"),
-) -> list[DocumentOut]:
-    session: Session = SessionLocal()
-    try:
-        sort_map: dict[str, ColumnElement] = {
-            "created_at": Document.created_at,
-            "updated_at": Document.updated_at,
-            "filename": Document.filename,
-            "status": Document.status,
-            "stage": Document.stage,
-            "progress": Document.progress,
-            "chunk_count": Document.chunk_count,
-            "entity_count": Document.entity_count,
-        }
-
-        sort_key = (sort or "created_at").strip().lower()
-        col = sort_map.get(sort_key)
-        if col is None:
-            raise HTTPException(status_code=400, detail=f"Invalid sort: {sort}")
-
-        order_key = (order or "desc").strip().lower()
-        if order_key == "asc":
-            order_by = col.asc()
-        elif order_key == "desc":
-            order_by = col.desc()
-        else:
-            raise HTTPException(status_code=400, detail=f"Invalid order: {order}")
-
-        q = session.query(Document).filter(_doc_access_predicate(ctx)).order_by(order_by, Document.doc_id.asc())
-        if status:
-            try:
-                q = q.filter(Document.status == DocumentStatus(status))
-            except Exception:
-                raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
-        docs = q.offset(offset).limit(limit).all()
-        return [DocumentOut.model_validate(d) for d in docs]
-    finally:
-        session.close()
+    session: Session = Depends(get_read_db),
+) -> Response:
+    sort_map: dict[str, ColumnElement] = {
+        "created_at": Document.created_at,
+        "updated_at": Document.updated_at,
+        "filename": Document.filename,
+        "status": Document.status,
+        "stage": Document.stage,
+        "progress": Document.progress,
+        "chunk_count": Document.chunk_count,
+        "entity_count": Document.entity_count,
+    }
+
+    sort_key = (sort or "created_at").strip().lower()
+    col = sort_map.get(sort_key)
+    if col is None:
+        raise HTTPException(status_code=400, detail=f"Invalid sort: {sort}")
+
+    order_key = (order or "desc").strip().lower()
+    if order_key == "asc":
+        order_by = (col.asc(), Document.doc_id.asc())
+    elif order_key == "desc":
+        order_by = (col.desc(), Document.doc_id.desc())
+    else:
+        raise HTTPException(status_code=400, detail=f"Invalid order: {order}")
+
+    # The doc_id tiebreak runs in the same direction as the sort, so (col, doc_id) is one scan direction of
+    # ix_documents_tenant_created_doc and the cursor seek below is a single row-value range on it.
+    q = session.query(Document).filter(_doc_access_predicate(ctx)).order_by(*order_by)
+    if status:
+        try:
+            q = q.filter(Document.status == DocumentStatus(status))
+        except Exception:
+            raise HTTPException(status_code=400, detail=f"Invalid status: {status}")
+    if after:
+        if offset:
+            raise HTTPException(status_code=400, detail="Use either after or offset, not both")
+        # Seek past the cursor row instead of scanning and discarding `offset` rows.
+        value, after_id = _decode_cursor(after, sort_key, order_key)
+        seek = tuple_(col, Document.doc_id)
+        q = q.filter(seek < (value, after_id) if order_key == "desc" else seek > (value, after_id))
+    elif offset:
+        q = q.offset(offset)
+    docs = q.limit(limit).all()
+    body = _DOCUMENT_LIST.dump_json([DocumentOut.model_validate(d) for d in docs])
+    headers = None
+    if len(docs) == limit:
+        last = docs[-1]
+        headers = {"X-Next-Cursor": _encode_cursor(sort_key, order_key, getattr(last, sort_key), last.doc_id)}
+    return conditional_json(request, body, headers)
 
 
 @router.get("/documents/{doc_id}", response_model=DocumentOut)
-def get_document(doc_id: str, ctx: RequestContext = Depends(get_request_context)) -> DocumentOut:
-    session: Session = SessionLocal()
-    try:
-        doc = session.query(Document).filter(Document.doc_id == doc_id, _doc_access_predicate(ctx)).one_or_none()
-        if not doc:
-            raise HTTPException(status_code=404, detail="Document not found")
-        return DocumentOut.model_validate(doc)
-    finally:
-        session.close()
+def get_document(
+    doc_id: str,
+    ctx: RequestContext = Depends(get_request_context),
+    session: Session = Depends(get_read_db),
+) -> DocumentOut:
+    doc = session.query(Document).filter(Document.doc_id == doc_id, _doc_access_predicate(ctx)).one_or_none()
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return DocumentOut.model_validate(doc)
@@ -4,11 +4,11 @@ from typing import Optional
 
 from fastapi import APIRouter, Depends, Query
 
-from rag_service.api.deps import RequestContext, get_request_context
+from rag_service.api.deps import API_SECURITY, RequestContext, get_request_context
 from rag_service.retrieval.graph_search import GraphSearch
 
 
-router = APIRouter(prefix="/v1/graph", tags=["graph"])
+router = APIRouter(prefix="/v1/graph", tags=["graph"], dependencies=API_SECURITY)
 
 
 @router.get("/entities")
@@ -1,22 +1,29 @@
 from __future__ import annotations
 
 import json
+import shutil
+import threading
+import time
 import uuid
+from concurrent.futures import Future
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from pydantic import BaseModel
 import redis
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from rag_service.api.deps import RequestContext, get_request_context
+from rag_service.api.deps import API_SECURITY, RequestContext, get_request_context
 from rag_service.config.settings import settings
+from rag_service.db.clients import progress_key, redis_client
 from rag_service.db.models import Document, DocumentScope, DocumentStatus
 from rag_service.db.session import SessionLocal
 
 
-router = APIRouter(prefix="/v1", tags=["ingest"])
+router = APIRouter(prefix="/v1", tags=["ingest"], dependencies=API_SECURITY)
 
 
 class IngestResponse(BaseModel):
@@ -51,30 +58,136 @@ def _sanitize_display_filename(raw: str, *, default: str) -> str:
     return name[:512]
 
 
-def _publish_queued(
-    r: redis.Redis,
-    *,
-    doc_id: str,
-    tenant_id: str,
-    scope: str,
-    workspace_id: str | None,
-    principal_id: str | None,
-    filename: str,
-) -> None:
+def _publish_queued(pipe: redis.client.Pipeline, doc: Document) -> None:
+    # Only buffers the commands; the caller executes the pipeline once the batch is committed.
     payload = {
-        "doc_id": doc_id,
-        "tenant_id": tenant_id,
-        "scope": scope,
-        "workspace_id": workspace_id,
-        "principal_id": principal_id,
-        "filename": filename,
+        "doc_id": doc.doc_id,
+        "tenant_id": doc.tenant_id,
+        "scope": doc.scope.value,
+        "workspace_id": doc.workspace_id,
+        "principal_id": doc.principal_id,
+        "filename": doc.filename,
         "stage": "queued",
         "progress": 0,
         "message": "Queued for ingestion",
         "timestamp": _now_iso(),
     }
-    r.setex(f"progress:{doc_id}", 3600, json.dumps(payload))
-    r.publish(settings.redis_progress_channel, json.dumps(payload))
+    data = json.dumps(payload)
+    pipe.setex(progress_key(doc.tenant_id, doc.doc_id), 3600, data)
+    pipe.publish(settings.redis_progress_channel, data)
+
+
+def _enqueue_pipeline(docs: list[Document]) -> redis.client.Pipeline:
+    # Queue pushes, progress entries and publishes go out in one round trip on a pooled connection.
+    # Buffered before the commit (the rows expire on commit) and executed after it, so a worker never
+    # pops a doc_id it can't load.
+    pipe = redis_client().pipeline(transaction=False)
+    for doc in docs:
+        pipe.lpush(settings.redis_queue, json.dumps({"doc_id": doc.doc_id}))
+        _publish_queued(pipe, doc)
+    return pipe
+
+
+def _commit(docs: list[Document]) -> None:
+    session: Session = SessionLocal()
+    try:
+        session.add_all(docs)
+        session.commit()
+    finally:
+        session.close()
+
+
+def _commit_and_enqueue(docs: list[Document]) -> None:
+    pipe = _enqueue_pipeline(docs)
+    _commit(docs)
+    pipe.execute()
+
+
+class _IngestBatcher:
+    """Fan concurrent uploads into one Postgres commit and one Redis pipeline per batch.
+
+    Callers block in ``submit`` until their batch is flushed. A lone upload is flushed straight away;
+    uploads that pile up during a flush form the next batch, which stays open while more keep arriving.
+    If a batch commit fails, its uploads are retried one commit each so one bad row only fails its own caller.
+    """
+
+    def __init__(self, window_s: float, max_items: int) -> None:
+        self._window_s = window_s
+        self._max_items = max_items
+        self._cond = threading.Condition()
+        self._pending: list[tuple[Document, Future[None]]] = []
+        self._thread: threading.Thread | None = None
+
+    def submit(self, doc: Document) -> None:
+        fut: Future[None] = Future()
+        with self._cond:
+            self._pending.append((doc, fut))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ingest-batcher", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        fut.result()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Only wait for company while it is actually arriving: each short gap must bring another
+                # upload, and the whole batch never waits longer than the window.
+                deadline = time.monotonic() + self._window_s
+                seen = len(self._pending)
+                while 1 < seen < self._max_items:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(min(remaining, _INGEST_BATCH_GAP_S))
+                    if len(self._pending) == seen:
+                        break
+                    seen = len(self._pending)
+                batch = self._pending[: self._max_items]
+                del self._pending[: self._max_items]
+            docs = [doc for doc, _ in batch]
+            try:
+                pipe = _enqueue_pipeline(docs)
+                _commit(docs)
+            except BaseException as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                else:
+                    self._flush_each(batch)
+                continue
+            try:
+                pipe.execute()
+            except BaseException as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+            else:
+                for _, fut in batch:
+                    fut.set_result(None)
+
+    @staticmethod
+    def _flush_each(batch: list[tuple[Document, Future[None]]]) -> None:
+        # The failed commit rolled back as a whole; the rows are transient again and can be retried alone.
+        for doc, fut in batch:
+            try:
+                _commit_and_enqueue([doc])
+            except BaseException as e:
+                fut.set_exception(e)
+            else:
+                fut.set_result(None)
+
+
+_INGEST_BATCH_MAX = 32
+_INGEST_BATCH_GAP_S = 0.005
+
+
+@lru_cache(maxsize=1)
+def _ingest_batcher() -> _IngestBatcher:
+    return _IngestBatcher(settings.ingest_batch_ms / 1000.0, _INGEST_BATCH_MAX)
+
+
+_UPLOAD_COPY_CHUNK = 1024 * 1024
 
 
 @router.post("/ingest/document", response_model=IngestResponse)
@@ -107,43 +220,39 @@ def ingest_document(
     storage_filename = Path(display_filename).name
     storage_path = uploads_dir / storage_filename
 
-    content = file.file.read()
-    if not content:
+    # Copied in bounded chunks so large uploads never sit in memory whole.
+    with storage_path.open("wb") as dst:
+        shutil.copyfileobj(file.file, dst, _UPLOAD_COPY_CHUNK)
+        size = dst.tell()
+    if not size:
+        storage_path.unlink(missing_ok=True)
+        uploads_dir.rmdir()
         raise HTTPException(status_code=400, detail="Empty upload")
-    storage_path.write_bytes(content)
 
     content_type = file.content_type or "application/octet-stream"
 
-    session: Session = SessionLocal()
-    try:
-        doc = Document(
-            doc_id=doc_id,
-            tenant_id=ctx.tenant_id,
-            scope=doc_scope,
-            workspace_id=workspace_id if doc_scope != DocumentScope.tenant else None,
-            principal_id=principal_id if doc_scope == DocumentScope.user else None,
-            filename=display_filename,
-            content_type=content_type,
-            storage_path=str(storage_path),
-            status=DocumentStatus.queued,
-            stage="queued",
-            progress=0,
-        )
-        session.add(doc)
-        session.commit()
-    finally:
-        session.close()
-
-    r = redis.Redis.from_url(settings.redis_url, decode_responses=True)
-    r.lpush(settings.redis_queue, json.dumps({"doc_id": doc_id}))
-    _publish_queued(
-        r,
+    doc = Document(
         doc_id=doc_id,
         tenant_id=ctx.tenant_id,
-        scope=doc_scope.value,
+        scope=doc_scope,
         workspace_id=workspace_id if doc_scope != DocumentScope.tenant else None,
         principal_id=principal_id if doc_scope == DocumentScope.user else None,
         filename=display_filename,
+        content_type=content_type,
+        storage_path=str(storage_path),
+        status=DocumentStatus.queued,
+        stage="queued",
+        progress=0,
     )
+    try:
+        if settings.ingest_batch_ms > 0:
+            _ingest_batcher().submit(doc)
+        else:
+            _commit_and_enqueue([doc])
+    except SQLAlchemyError:
+        # No row was written, so nothing will ever pick the file up.
+        storage_path.unlink(missing_ok=True)
+        uploads_dir.rmdir()
+        raise
 
     return IngestResponse(doc_id=doc_id, status="queued")
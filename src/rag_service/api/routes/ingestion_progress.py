@@ -2,64 +2,66 @@ from __future__ import annotations
 
 import json
 import time
-from typing import Iterator
+from typing import AsyncIterator
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
-import redis
 from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session
 
 from rag_service.config.settings import settings
-from rag_service.api.deps import RequestContext, get_request_context
+from rag_service.api.conditional import conditional_json
+from rag_service.api.deps import API_SECURITY, RequestContext, get_read_db, get_request_context
+from rag_service.db.clients import PUBSUB_MAX_CONNECTIONS, async_pubsub_client, legacy_progress_key, progress_key, redis_client
 from rag_service.db.models import Document, DocumentScope, DocumentStatus
-from rag_service.db.session import SessionLocal
 
 
-router = APIRouter(prefix="/v1/ingestions", tags=["ingestion-progress"])
+router = APIRouter(prefix="/v1/ingestions", tags=["ingestion-progress"], dependencies=API_SECURITY)
 
 
 @router.get("/active")
-def active(ctx: RequestContext = Depends(get_request_context)):
-    session = SessionLocal()
-    try:
-        access = [and_(Document.tenant_id == ctx.tenant_id, Document.scope == DocumentScope.tenant)]
-        if ctx.workspace_id:
+def active(
+    request: Request,
+    ctx: RequestContext = Depends(get_request_context),
+    session: Session = Depends(get_read_db),
+) -> Response:
+    access = [and_(Document.tenant_id == ctx.tenant_id, Document.scope == DocumentScope.tenant)]
+    if ctx.workspace_id:
+        access.append(
+            and_(
+                Document.tenant_id == ctx.tenant_id,
+                Document.scope == DocumentScope.workspace,
+                Document.workspace_id == ctx.workspace_id,
+            )
+        )
+        if ctx.principal_id:
             access.append(
                 and_(
                     Document.tenant_id == ctx.tenant_id,
-                    Document.scope == DocumentScope.workspace,
+                    Document.scope == DocumentScope.user,
                     Document.workspace_id == ctx.workspace_id,
+                    Document.principal_id == ctx.principal_id,
                 )
             )
-            if ctx.principal_id:
-                access.append(
-                    and_(
-                        Document.tenant_id == ctx.tenant_id,
-                        Document.scope == DocumentScope.user,
-                        Document.workspace_id == ctx.workspace_id,
-                        Document.principal_id == ctx.principal_id,
-                    )
-                )
 
-        docs = (
-            session.query(Document)
-            .filter(
-                and_(
-                    or_(*access),
-                    or_(Document.status == DocumentStatus.queued, Document.status == DocumentStatus.processing),
-                )
+    docs = (
+        session.query(Document)
+        .filter(
+            and_(
+                or_(*access),
+                or_(Document.status == DocumentStatus.queued, Document.status == DocumentStatus.processing),
             )
-            .order_by(Document.created_at.desc())
-            .limit(500)
-            .all()
         )
-    finally:
-        session.close()
+        .order_by(Document.created_at.desc())
+        .limit(500)
+        .all()
+    )
 
-    r = redis.Redis.from_url(settings.redis_url, decode_responses=True)
+    r = redis_client()
     out = []
     for d in docs:
-        cached = r.get(f"progress:{d.doc_id}")
+        # Jobs still running on a pre-upgrade worker only have the legacy key.
+        cached = r.get(progress_key(d.tenant_id, d.doc_id)) or r.get(legacy_progress_key(d.doc_id))
         if cached:
             try:
                 out.append(json.loads(cached))
@@ -75,11 +77,21 @@ def active(ctx: RequestContext = Depends(get_request_context)):
                 "timestamp": d.updated_at.isoformat() if d.updated_at else None,
             }
         )
-    return {"active": out}
+    return conditional_json(request, json.dumps({"active": out}, separators=(",", ":")).encode())
+
+
+_STREAM_HEARTBEAT_S = 10.0
+# Every open stream is one Redis subscriber (one pub/sub connection plus a fan-out copy of each progress
+# event), so the cost grows with the number of listeners; past the pool size, new streams get a 503.
+_STREAM_MAX = PUBSUB_MAX_CONNECTIONS
+_open_streams = 0
 
 
 @router.get("/stream")
-def stream(ctx: RequestContext = Depends(get_request_context)):
+async def stream(ctx: RequestContext = Depends(get_request_context)):
+    if _open_streams >= _STREAM_MAX:
+        raise HTTPException(status_code=503, detail="Too many open progress streams", headers={"Retry-After": "5"})
+
     def allowed(event: dict) -> bool:
         if event.get("tenant_id") != ctx.tenant_id:
             return False
@@ -97,25 +109,34 @@ def stream(ctx: RequestContext = Depends(get_request_context)):
             )
         return False
 
-    def gen() -> Iterator[str]:
-        r = redis.Redis.from_url(settings.redis_url, decode_responses=True)
-        pubsub = r.pubsub()
-        pubsub.subscribe(settings.redis_progress_channel)
-        yield f"data: {json.dumps({'type': 'connected'})}\n\n"
+    async def gen() -> AsyncIterator[str]:
+        # Async so an open stream waits on the event loop rather than pinning a threadpool worker.
+        global _open_streams
+        _open_streams += 1
+        pubsub = async_pubsub_client().pubsub(ignore_subscribe_messages=True)
         try:
+            await pubsub.subscribe(settings.redis_progress_channel)
+            yield f"data: {json.dumps({'type': 'connected'})}\n\n"
+            last_sent = time.monotonic()
             while True:
-                msg = pubsub.get_message(timeout=1.0)
+                wait = max(0.0, _STREAM_HEARTBEAT_S - (time.monotonic() - last_sent))
+                msg = await pubsub.get_message(timeout=wait)
                 if msg and msg.get("type") == "message":
                     try:
                         data = json.loads(msg.get("data") or "{}")
-                        if allowed(data):
-                            yield f"data: {json.dumps(data)}\n\n"
                     except Exception:
-                        pass
-                time.sleep(0.1)
+                        continue
+                    if allowed(data):
+                        yield f"data: {json.dumps(data)}\n\n"
+                        last_sent = time.monotonic()
+                elif time.monotonic() - last_sent >= _STREAM_HEARTBEAT_S:
+                    # SSE comment line: keeps idle connections open through proxies and surfaces dead clients.
+                    yield ": ping\n\n"
+                    last_sent = time.monotonic()
         finally:
+            _open_streams -= 1
             try:
-                pubsub.close()
+                await pubsub.aclose()
             except Exception:
                 pass
 
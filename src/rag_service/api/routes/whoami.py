@@ -3,10 +3,10 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
-from rag_service.api.deps import RequestContext, get_request_context
+from rag_service.api.deps import API_SECURITY, RequestContext, get_request_context
 
 
-router = APIRouter(prefix="/v1", tags=["meta"])
+router = APIRouter(prefix="/v1", tags=["meta"], dependencies=API_SECURITY)
 
 
 class WhoAmIResponse(BaseModel):
@@ -3,6 +3,7 @@ from __future__ import annotations
 import hashlib
 import json
 from dataclasses import dataclass
+from functools import cached_property
 from typing import Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -42,6 +43,8 @@ class Settings(BaseSettings):
     neo4j_database: str = Field(default="neo4j", alias="NEO4J_DATABASE")
 
     rag_data_dir: str = Field(default="/data", alias="RAG_DATA_DIR")
+    # Window for grouping concurrent uploads into one commit + Redis round trip (0 disables batching).
+    ingest_batch_ms: int = Field(default=50, alias="INGEST_BATCH_MS")
 
     rag_tenants_json: str = Field(
         default='[{"tenant_id":"signal305","api_key":"dev-signal305-key"}]',
@@ -104,11 +107,17 @@ class Settings(BaseSettings):
         except Exception:
             return []
 
-    def tenant_id_for_api_key(self, api_key: str) -> Optional[str]:
+    @cached_property
+    def api_key_tenants(self) -> dict[str, str]:
+        # Built once: tenant_id_for_api_key() is on every authenticated request.
+        # Later entries don't override earlier ones, matching the old first-match scan.
+        out: dict[str, str] = {}
         for t in self.tenants():
-            if t.api_key == api_key:
-                return t.tenant_id
-        return None
+            out.setdefault(t.api_key, t.tenant_id)
+        return out
+
+    def tenant_id_for_api_key(self, api_key: str) -> Optional[str]:
+        return self.api_key_tenants.get(api_key)
 
 
 settings = Settings()
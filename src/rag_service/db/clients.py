@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from neo4j import Driver, GraphDatabase
+import redis
+import redis.asyncio as aioredis
+
+from rag_service.config.settings import settings
+
+
+# Process-wide clients: handlers borrow pooled connections instead of reconnecting per request.
+
+
+@lru_cache(maxsize=1)
+def _redis_pool() -> redis.BlockingConnectionPool:
+    # Blocking pool: when all connections are busy, callers wait for one instead of failing.
+    return redis.BlockingConnectionPool.from_url(settings.redis_url, decode_responses=True, max_connections=32, timeout=10)
+
+
+def redis_client() -> redis.Redis:
+    return redis.Redis(connection_pool=_redis_pool())
+
+
+@lru_cache(maxsize=1)
+def _async_redis_pool() -> aioredis.BlockingConnectionPool:
+    return aioredis.BlockingConnectionPool.from_url(settings.redis_url, decode_responses=True, max_connections=32, timeout=10)
+
+
+def async_redis_client() -> aioredis.Redis:
+    # For async handlers; commands are awaited on the event loop instead of holding a threadpool worker.
+    return aioredis.Redis(connection_pool=_async_redis_pool())
+
+
+# Each pub/sub subscriber holds its connection for as long as it listens, so subscribers get their own pool and
+# can never starve the command pool above. This one does not block: once it is full, callers get a
+# ConnectionError straight away.
+PUBSUB_MAX_CONNECTIONS = 256
+
+
+@lru_cache(maxsize=1)
+def _async_pubsub_pool() -> aioredis.ConnectionPool:
+    return aioredis.ConnectionPool.from_url(settings.redis_url, decode_responses=True, max_connections=PUBSUB_MAX_CONNECTIONS)
+
+
+def async_pubsub_client() -> aioredis.Redis:
+    return aioredis.Redis(connection_pool=_async_pubsub_pool())
+
+
+def progress_key(tenant_id: str, doc_id: str) -> str:
+    # Tenant segment first, so a tenant's progress keys can be derived from its doc_ids without a SCAN.
+    return f"progress:{tenant_id}:{doc_id}"
+
+
+def legacy_progress_key(doc_id: str) -> str:
+    # Pre-tenant format, still written by workers from before the upgrade. Readers fall back to it, and
+    # resets unlink it too, until its 1h TTL has aged out every old entry.
+    return f"progress:{doc_id}"
+
+
+@lru_cache(maxsize=1)
+def neo4j_driver() -> Driver:
+    return GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_password))
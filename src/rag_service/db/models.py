@@ -3,7 +3,7 @@ from __future__ import annotations
 import enum
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Enum, Integer, String, Text
+from sqlalchemy import DateTime, Enum, Index, Integer, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -52,3 +52,7 @@ class Document(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
+    # Backs the default document listing (newest first per tenant) and its keyset cursor: the listing orders
+    # by (created_at, doc_id) in one direction and seeks with a row-value comparison, which Postgres runs as a
+    # single Index Cond range (Index Scan Backward under EXPLAIN) instead of filtering plus an incremental sort.
+    __table_args__ = (Index("ix_documents_tenant_created_doc", "tenant_id", "created_at", "doc_id"),)
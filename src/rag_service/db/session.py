@@ -8,4 +8,9 @@ from rag_service.config.settings import settings
 
 engine = create_engine(settings.database_url, pool_pre_ping=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# For read-only request handlers: same pool, but each statement runs in autocommit mode, so a read costs no
+# BEGIN/COMMIT round trips and holds no transaction open while the response is built.
+ReadSessionLocal = sessionmaker(
+    bind=engine.execution_options(isolation_level="AUTOCOMMIT"), autoflush=False, autocommit=False
+)
 
@@ -13,6 +13,7 @@ import redis
 import structlog
 
 from rag_service.config.settings import settings
+from rag_service.db.clients import progress_key
 from rag_service.db.models import Base, Document, DocumentStatus
 from rag_service.db.session import SessionLocal, engine
 from rag_service.ingestion.dynamic_chunker import chunk_pdf_file, chunk_text_file
@@ -59,7 +60,7 @@ def publish_progress(r: redis.Redis, doc: Document, stage: str, message: str) ->
         "message": message,
         "timestamp": _now_iso(),
     }
-    r.setex(f"progress:{doc.doc_id}", 3600, json.dumps(payload))
+    r.setex(progress_key(doc.tenant_id, doc.doc_id), 3600, json.dumps(payload))
     r.publish(settings.redis_progress_channel, json.dumps(payload))
 
 
@@ -1,17 +1,10 @@
 from __future__ import annotations
 
-from functools import lru_cache
 from typing import Any
 
-from neo4j import GraphDatabase
-
 from rag_service.api.deps import RequestContext
 from rag_service.config.settings import settings
-
-
-@lru_cache(maxsize=1)
-def _driver():
-    return GraphDatabase.driver(settings.neo4j_uri, auth=(settings.neo4j_user, settings.neo4j_password))
+from rag_service.db.clients import neo4j_driver
 
 
 def _scope_filter_cypher(var: str = "c") -> str:
@@ -75,7 +68,7 @@ LIMIT $limit
             "entity_limit": int(entity_limit),
         }
 
-        with _driver().session(database=settings.neo4j_database) as session:
+        with neo4j_driver().session(database=settings.neo4j_database) as session:
             rows = session.run(query, **params)
             return [r.data() for r in rows]
 
@@ -109,7 +102,7 @@ LIMIT $limit
             "entity_type": (entity_type.strip() if entity_type else None),
             "limit": int(limit),
         }
-        with _driver().session(database=settings.neo4j_database) as session:
+        with neo4j_driver().session(database=settings.neo4j_database) as session:
             rows = session.run(query, **params)
             return [r.data() for r in rows]
 
@@ -144,7 +137,7 @@ LIMIT $limit
             "entity_id": str(entity_id),
             "limit": int(limit),
         }
-        with _driver().session(database=settings.neo4j_database) as session:
+        with neo4j_driver().session(database=settings.neo4j_database) as session:
             rows = session.run(query, **params)
             return [r.data() for r in rows]
 
@@ -174,6 +167,6 @@ LIMIT $limit
             "doc_id": str(doc_id),
             "limit": int(limit),
         }
-        with _driver().session(database=settings.neo4j_database) as session:
+        with neo4j_driver().session(database=settings.neo4j_database) as session:
             rows = session.run(query, **params)
             return [r.data() for r in rows]